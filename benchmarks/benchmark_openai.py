@@ -2,16 +2,30 @@
 from __future__ import annotations
 
 import argparse
+import http.client
+import itertools
 import json
 import os
+import queue
 import random
 import statistics
 import sys
 import time
+import urllib.parse
 import urllib.request
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
 
+import results_store
+
+SWEEP_AXES = ["requests", "concurrency", "max_tokens", "temperature"]
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
 
 def load_prompts(path: str) -> list[str]:
     prompts = []
@@ -36,6 +50,68 @@ def request_json(method: str, url: str, payload: Optional[dict], timeout: float)
         return json.loads(resp.read().decode("utf-8"))
 
 
+class ConnectionPool:
+    """Keep-alive HTTP connections reused across requests and sweep points."""
+
+    def __init__(self, base_url: str, timeout: float):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.conn_cls = (
+            http.client.HTTPSConnection if parsed.scheme == "https" else http.client.HTTPConnection
+        )
+        self.netloc = parsed.netloc
+        self.path_prefix = parsed.path.rstrip("/")
+        self.timeout = timeout
+        self.idle: queue.LifoQueue = queue.LifoQueue()
+
+    def request_json(self, method: str, path: str, payload: Optional[dict]) -> dict:
+        data = None
+        headers = {"Content-Type": "application/json"}
+        if payload is not None:
+            data = json.dumps(payload).encode("utf-8")
+        try:
+            conn = self.idle.get_nowait()
+            reused = True
+        except queue.Empty:
+            conn = self.conn_cls(self.netloc, timeout=self.timeout)
+            reused = False
+        try:
+            resp, body = self._send(conn, method, path, data, headers)
+        except STALE_CONNECTION_ERRORS:
+            # The server may have closed an idle keep-alive socket; retry once on a fresh one.
+            if not reused:
+                raise
+            conn = self.conn_cls(self.netloc, timeout=self.timeout)
+            resp, body = self._send(conn, method, path, data, headers)
+        if resp.status >= 400:
+            conn.close()
+            raise RuntimeError(f"HTTP Error {resp.status}: {resp.reason}")
+        self.idle.put(conn)
+        return json.loads(body.decode("utf-8"))
+
+    def _send(
+        self,
+        conn: http.client.HTTPConnection,
+        method: str,
+        path: str,
+        data: Optional[bytes],
+        headers: dict,
+    ) -> tuple[http.client.HTTPResponse, bytes]:
+        try:
+            conn.request(method, f"{self.path_prefix}{path}", body=data, headers=headers)
+            resp = conn.getresponse()
+            return resp, resp.read()
+        except Exception:
+            conn.close()
+            raise
+
+    def close(self) -> None:
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
 def wait_for_models_endpoint(
     base_url: str,
     startup_wait_s: float,
@@ -91,6 +167,7 @@ def run_one(
     max_tokens: int,
     temperature: float,
     timeout: float,
+    pool: Optional[ConnectionPool] = None,
 ) -> dict:
     url = f"{base_url}/chat/completions"
     payload = {
@@ -101,7 +178,10 @@ def run_one(
     }
     start = time.perf_counter()
     try:
-        body = request_json("POST", url, payload, timeout)
+        if pool is not None:
+            body = pool.request_json("POST", "/chat/completions", payload)
+        else:
+            body = request_json("POST", url, payload, timeout)
         elapsed = time.perf_counter() - start
         usage = body.get("usage", {}) if isinstance(body, dict) else {}
         return {
@@ -162,6 +242,159 @@ def summarize(results: list[dict], total_elapsed_s: float, concurrency: int) ->
     return summary
 
 
+def run_point(
+    base_url: str,
+    model: str,
+    prompts: list[str],
+    requests: int,
+    concurrency: int,
+    max_tokens: int,
+    temperature: float,
+    timeout: float,
+    pool: Optional[ConnectionPool] = None,
+) -> tuple[list[dict], float]:
+    start_all = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = []
+        for i in range(requests):
+            prompt = random.choice(prompts)
+            futures.append(
+                executor.submit(
+                    run_one,
+                    i,
+                    base_url,
+                    model,
+                    prompt,
+                    max_tokens,
+                    temperature,
+                    timeout,
+                    pool,
+                )
+            )
+        for future in as_completed(futures):
+            results.append(future.result())
+    return results, time.perf_counter() - start_all
+
+
+def load_sweep_spec(path: str) -> list[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    return spec if isinstance(spec, list) else [spec]
+
+
+def is_int(value: object) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def validate_sweep_value(name: str, axis: str, value: object) -> None:
+    if axis == "temperature":
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            raise ValueError(f"Sweep matrix {name}: temperature must be a number >= 0, got {value!r}")
+    elif not is_int(value) or value <= 0:
+        raise ValueError(f"Sweep matrix {name}: {axis} must be an integer > 0, got {value!r}")
+
+
+def expand_sweep_spec(spec: list[dict]) -> list[dict]:
+    """Expand each matrix into points: requests x concurrency x max_tokens x temperature x repeats."""
+    points = []
+    names = set()
+    for i, matrix in enumerate(spec):
+        # Unnamed matrices get a positional name so summaries never merge them.
+        name = str(matrix.get("name") or f"matrix{i}")
+        if name in names:
+            raise ValueError(f"Duplicate sweep matrix name: {name}")
+        names.add(name)
+        unknown = set(matrix) - set(SWEEP_AXES) - {"name", "repeats"}
+        if unknown:
+            raise ValueError(f"Unknown sweep spec keys: {', '.join(sorted(unknown))}")
+        missing = [axis for axis in ("requests", "concurrency", "max_tokens") if axis not in matrix]
+        if missing:
+            raise ValueError(f"Sweep matrix missing keys: {', '.join(missing)}")
+        axes = []
+        for axis in SWEEP_AXES:
+            values = matrix.get(axis, [0.0] if axis == "temperature" else None)
+            values = values if isinstance(values, list) else [values]
+            if not values:
+                raise ValueError(f"Sweep matrix {name}: {axis} must not be empty")
+            for value in values:
+                validate_sweep_value(name, axis, value)
+            axes.append(values)
+        repeats = matrix.get("repeats", 1)
+        if not is_int(repeats) or repeats < 1:
+            raise ValueError(f"Sweep matrix {name}: repeats must be an integer >= 1, got {repeats!r}")
+        for combo in itertools.product(*axes):
+            for repeat in range(repeats):
+                point = dict(zip(SWEEP_AXES, combo))
+                point["temperature"] = float(point["temperature"])
+                point["repeat"] = repeat
+                point["matrix"] = name
+                points.append(point)
+    return points
+
+
+def run_sweep(
+    args: argparse.Namespace,
+    model: str,
+    prompts: list[str],
+    spec: list[dict],
+    points: list[dict],
+) -> int:
+    repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    metadata = results_store.environment_metadata(repo_dir, args.tp_size, args.container)
+    for key in ("tp_size", "container"):
+        if not metadata[key]:
+            print(f"Warning: {key} is unknown and will be stored empty; pass --{key.replace('_', '-')}")
+
+    conn = results_store.connect(args.results_db)
+    run_id = results_store.start_run(conn, model, args.base_url, args.prompts_file, spec, metadata)
+    print(f"Sweep run {run_id}: {len(points)} points -> {args.results_db}")
+
+    pool = ConnectionPool(args.base_url, args.timeout)
+    any_failed = False
+    try:
+        for idx, point in enumerate(points):
+            if idx > 0 and args.cooldown_s > 0:
+                time.sleep(args.cooldown_s)
+            print(
+                f"\n=== Point {idx + 1}/{len(points)}: requests={point['requests']}, "
+                f"concurrency={point['concurrency']}, max_tokens={point['max_tokens']}, "
+                f"temperature={point['temperature']}, repeat={point['repeat']} ==="
+            )
+            started_at = time.time()
+            results, elapsed = run_point(
+                args.base_url,
+                model,
+                prompts,
+                point["requests"],
+                point["concurrency"],
+                point["max_tokens"],
+                point["temperature"],
+                args.timeout,
+                pool,
+            )
+            summary = summarize(results, elapsed, point["concurrency"])
+            summary["model"] = model
+            summary["base_url"] = args.base_url
+            summary["max_tokens"] = point["max_tokens"]
+            summary["temperature"] = point["temperature"]
+            results_store.record_point(conn, run_id, idx, point, started_at, summary, results)
+            any_failed = any_failed or summary["requests_failed"] > 0
+            print(
+                f"ok={summary['requests_ok']} failed={summary['requests_failed']} "
+                f"p95={summary['latency_p95_s']:.3f}s "
+                f"throughput_completion_tokens_s={summary['throughput_completion_tokens_s']:.3f}"
+            )
+        # Interrupted or failed sweeps keep finished_at unset so they show as partial.
+        results_store.finish_run(conn, run_id)
+    finally:
+        pool.close()
+        conn.close()
+
+    print(f"\nWrote sweep run {run_id} to {args.results_db}")
+    return 1 if any_failed else 0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Simple OpenAI-compatible benchmark runner")
     parser.add_argument("--base-url", default="http://127.0.0.1:8000/v1")
@@ -195,6 +428,28 @@ def main() -> int:
         default="benchmarks/results/latest_raw.json",
         help="Per-request output path on local filesystem",
     )
+    parser.add_argument(
+        "--sweep-spec",
+        default=None,
+        help="JSON matrix spec; run every point in this process and write to --results-db",
+    )
+    parser.add_argument(
+        "--results-db",
+        default="benchmarks/results/results.sqlite",
+        help="SQLite results store used in sweep mode",
+    )
+    parser.add_argument(
+        "--cooldown-s",
+        type=float,
+        default=2.0,
+        help="Pause between sweep points (keep below the server's keep-alive timeout, 5s for vLLM)",
+    )
+    parser.add_argument("--tp-size", default=None, help="Recorded in sweep metadata (default: $TP_SIZE)")
+    parser.add_argument(
+        "--container",
+        default=None,
+        help="Recorded in sweep metadata (default: $APPTAINER_CONTAINER or $CONTAINER)",
+    )
     args = parser.parse_args()
 
     if args.requests <= 0:
@@ -209,6 +464,13 @@ def main() -> int:
         raise ValueError("--startup-wait-s must be >= 0")
     if args.startup_poll_s <= 0:
         raise ValueError("--startup-poll-s must be > 0")
+    if args.cooldown_s < 0:
+        raise ValueError("--cooldown-s must be >= 0")
+
+    if args.sweep_spec:
+        # Validate the whole matrix before waiting on the server.
+        sweep_spec = load_sweep_spec(args.sweep_spec)
+        sweep_points = expand_sweep_spec(sweep_spec)
 
     # Graceful startup handling: wait for vLLM readiness instead of failing fast
     # with connection-refused when the server is still loading weights.
@@ -233,32 +495,25 @@ def main() -> int:
     model = args.model or model_id_from_models_response(models_body, args.base_url)
     print(f"Benchmark model: {model}")
     print(f"Base URL: {args.base_url}")
+
+    if args.sweep_spec:
+        return run_sweep(args, model, prompts, sweep_spec, sweep_points)
+
     print(
         f"Requests: {args.requests}, Concurrency: {args.concurrency}, "
         f"Max tokens: {args.max_tokens}, Temperature: {args.temperature}"
     )
 
-    start_all = time.perf_counter()
-    results = []
-    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
-        futures = []
-        for i in range(args.requests):
-            prompt = random.choice(prompts)
-            futures.append(
-                pool.submit(
-                    run_one,
-                    i,
-                    args.base_url,
-                    model,
-                    prompt,
-                    args.max_tokens,
-                    args.temperature,
-                    args.timeout,
-                )
-            )
-        for future in as_completed(futures):
-            results.append(future.result())
-    elapsed = time.perf_counter() - start_all
+    results, elapsed = run_point(
+        args.base_url,
+        model,
+        prompts,
+        args.requests,
+        args.concurrency,
+        args.max_tokens,
+        args.temperature,
+        args.timeout,
+    )
 
     summary = summarize(results, elapsed, args.concurrency)
     summary["model"] = model
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""SQLite results store shared by benchmark_openai.py and summarize_results.py."""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import time
+from typing import Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    model TEXT,
+    base_url TEXT,
+    tp_size TEXT,
+    container TEXT,
+    git_rev TEXT,
+    hostname TEXT,
+    slurm_job_id TEXT,
+    prompts_file TEXT,
+    spec_json TEXT
+);
+CREATE TABLE IF NOT EXISTS points (
+    point_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    point_index INTEGER NOT NULL,
+    matrix TEXT,
+    repeat INTEGER NOT NULL,
+    requests INTEGER NOT NULL,
+    concurrency INTEGER NOT NULL,
+    max_tokens INTEGER NOT NULL,
+    temperature REAL NOT NULL,
+    started_at REAL NOT NULL,
+    requests_ok INTEGER,
+    requests_failed INTEGER,
+    elapsed_s REAL,
+    throughput_req_s REAL,
+    throughput_tokens_s REAL,
+    throughput_completion_tokens_s REAL,
+    latency_p50_s REAL,
+    latency_p95_s REAL,
+    latency_p99_s REAL,
+    latency_mean_s REAL,
+    tokens_prompt_total INTEGER,
+    tokens_completion_total INTEGER,
+    tokens_total INTEGER,
+    summary_json TEXT
+);
+CREATE TABLE IF NOT EXISTS request_results (
+    point_id INTEGER NOT NULL REFERENCES points(point_id),
+    request_id INTEGER NOT NULL,
+    ok INTEGER NOT NULL,
+    latency_s REAL,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    total_tokens INTEGER,
+    prompt TEXT,
+    error TEXT
+);
+"""
+
+POINT_METRICS = [
+    "requests_ok",
+    "requests_failed",
+    "elapsed_s",
+    "throughput_req_s",
+    "throughput_tokens_s",
+    "throughput_completion_tokens_s",
+    "latency_p50_s",
+    "latency_p95_s",
+    "latency_p99_s",
+    "latency_mean_s",
+    "tokens_prompt_total",
+    "tokens_completion_total",
+    "tokens_total",
+]
+
+
+def connect(path: str) -> sqlite3.Connection:
+    db_dir = os.path.dirname(path)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def git_rev(repo_dir: str) -> str:
+    try:
+        out = subprocess.run(
+            ["git", "-C", repo_dir, "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return out.stdout.strip() if out.returncode == 0 else ""
+
+
+def environment_metadata(repo_dir: str, tp_size: Optional[str], container: Optional[str]) -> dict:
+    return {
+        "tp_size": tp_size or os.environ.get("TP_SIZE", ""),
+        "container": container
+        or os.environ.get("APPTAINER_CONTAINER")
+        or os.environ.get("SINGULARITY_CONTAINER")
+        or os.environ.get("CONTAINER", ""),
+        "git_rev": git_rev(repo_dir),
+        "hostname": socket.gethostname(),
+        "slurm_job_id": os.environ.get("SLURM_JOB_ID", ""),
+    }
+
+
+def start_run(
+    conn: sqlite3.Connection,
+    model: str,
+    base_url: str,
+    prompts_file: str,
+    spec: object,
+    metadata: dict,
+) -> int:
+    cur = conn.execute(
+        "INSERT INTO runs (started_at, model, base_url, tp_size, container, git_rev, hostname, "
+        "slurm_job_id, prompts_file, spec_json) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            time.time(),
+            model,
+            base_url,
+            metadata.get("tp_size", ""),
+            metadata.get("container", ""),
+            metadata.get("git_rev", ""),
+            metadata.get("hostname", ""),
+            metadata.get("slurm_job_id", ""),
+            prompts_file,
+            json.dumps(spec),
+        ),
+    )
+    conn.commit()
+    return cur.lastrowid
+
+
+def finish_run(conn: sqlite3.Connection, run_id: int) -> None:
+    conn.execute("UPDATE runs SET finished_at = ? WHERE run_id = ?", (time.time(), run_id))
+    conn.commit()
+
+
+def record_point(
+    conn: sqlite3.Connection,
+    run_id: int,
+    point_index: int,
+    point: dict,
+    started_at: float,
+    summary: dict,
+    results: list[dict],
+) -> int:
+    columns = [
+        "run_id",
+        "point_index",
+        "matrix",
+        "repeat",
+        "requests",
+        "concurrency",
+        "max_tokens",
+        "temperature",
+        "started_at",
+    ] + POINT_METRICS + ["summary_json"]
+    values = [
+        run_id,
+        point_index,
+        point.get("matrix", ""),
+        point["repeat"],
+        point["requests"],
+        point["concurrency"],
+        point["max_tokens"],
+        point["temperature"],
+        started_at,
+    ] + [summary.get(name) for name in POINT_METRICS] + [json.dumps(summary)]
+    cur = conn.execute(
+        f"INSERT INTO points ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+        values,
+    )
+    point_id = cur.lastrowid
+    conn.executemany(
+        "INSERT INTO request_results (point_id, request_id, ok, latency_s, prompt_tokens, "
+        "completion_tokens, total_tokens, prompt, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                point_id,
+                r["request_id"],
+                int(r["ok"]),
+                r["latency_s"],
+                r.get("prompt_tokens", 0),
+                r.get("completion_tokens", 0),
+                r.get("total_tokens", 0),
+                r.get("prompt", ""),
+                r.get("error"),
+            )
+            for r in results
+        ],
+    )
+    conn.commit()
+    return point_id
@@ -0,0 +1,40 @@
+#!/bin/bash
+set -euo pipefail
+
+if [ "$#" -lt 2 ]; then
+  echo "Usage: $0 <jobid> <sweep_spec.json> [cooldown_s]" >&2
+  echo "Example: TP_SIZE=1 CONTAINER=/appl/soft/ai/wrap/pytorch-2.9/container.sif $0 31752419 benchmarks/sweeps/benchmark_plan.json 2" >&2
+  exit 2
+fi
+
+JOBID="$1"
+SPEC="$2"
+COOLDOWN_S="${3:-2}"
+BASE_URL="${BASE_URL:-http://127.0.0.1:8000/v1}"
+# The srun step runs on the host, so the server's TP size and container must be passed in.
+TP_SIZE="${TP_SIZE:-}"
+CONTAINER="${CONTAINER:-}"
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+REPO_ROOT="$(cd "${SCRIPT_DIR}/.." && pwd)"
+OUT_DIR="${REPO_ROOT}/benchmarks/results/job_${JOBID}"
+
+mkdir -p "${OUT_DIR}"
+
+echo "Running sweep on job ${JOBID}"
+echo "Base URL: ${BASE_URL}"
+echo "Spec: ${SPEC}, Cooldown: ${COOLDOWN_S}s"
+echo "TP_SIZE=${TP_SIZE:-<unset>}, CONTAINER=${CONTAINER:-<unset>}"
+if [ -z "${TP_SIZE}" ] || [ -z "${CONTAINER}" ]; then
+  echo "WARNING: set TP_SIZE and CONTAINER to match the vLLM job; they are recorded with the run." >&2
+fi
+
+srun --jobid "${JOBID}" --overlap \
+  python3 "${REPO_ROOT}/benchmarks/benchmark_openai.py" \
+  --base-url "${BASE_URL}" \
+  --prompts-file "${REPO_ROOT}/benchmarks/prompts_puhti.txt" \
+  --sweep-spec "${SPEC}" \
+  --cooldown-s "${COOLDOWN_S}" \
+  --tp-size "${TP_SIZE}" \
+  --container "${CONTAINER}" \
+  --results-db "${OUT_DIR}/results.sqlite"
@@ -4,8 +4,10 @@ import glob
 import json
 import os
 import re
+import sqlite3
 import sys
-from typing import List, Dict
+from collections import defaultdict
+from typing import List, Dict, Optional
 
 
 NAME_RE = re.compile(r"summary_r(\d+)_c(\d+)_t(\d+)\.json$")
@@ -42,6 +44,97 @@ def load_rows(job_dir: str) -> List[Dict]:
     return rows
 
 
+def load_db_rows(db_path: str, run_id: Optional[int], matrix: Optional[str]) -> List[Dict]:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    if run_id is None:
+        latest = conn.execute("SELECT MAX(run_id) FROM runs").fetchone()[0]
+        run_id = latest if latest is not None else -1
+    query = (
+        "SELECT p.*, r.model, r.tp_size, r.git_rev FROM points p "
+        "JOIN runs r ON r.run_id = p.run_id WHERE p.run_id = ?"
+    )
+    params = [run_id]
+    if matrix:
+        query += " AND p.matrix = ?"
+        params.append(matrix)
+    rows = []
+    for p in conn.execute(query + " ORDER BY p.point_index", params):
+        rows.append(
+            {
+                "file": (
+                    f"run{p['run_id']}_r{p['requests']}_c{p['concurrency']}"
+                    f"_t{p['max_tokens']}_T{p['temperature']:g}_rep{p['repeat']}"
+                ),
+                "requests": p["requests"],
+                "concurrency": p["concurrency"],
+                "max_tokens": p["max_tokens"],
+                "temperature": p["temperature"],
+                "repeat": p["repeat"],
+                "matrix": p["matrix"],
+                "requests_total": int(p["requests"]),
+                "requests_ok": int(p["requests_ok"] or 0),
+                "requests_failed": int(p["requests_failed"] or 0),
+                "p50": float(p["latency_p50_s"] or 0.0),
+                "p95": float(p["latency_p95_s"] or 0.0),
+                "p99": float(p["latency_p99_s"] or 0.0),
+                "req_s": float(p["throughput_req_s"] or 0.0),
+                "tok_s": float(p["throughput_tokens_s"] or 0.0),
+                "ctok_s": float(p["throughput_completion_tokens_s"] or 0.0),
+            }
+        )
+    conn.close()
+    return rows
+
+
+def print_runs(db_path: str) -> None:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    print("run_id,started_at,finished_at,model,tp_size,container,git_rev,slurm_job_id,points")
+    for r in conn.execute(
+        "SELECT r.run_id, datetime(r.started_at, 'unixepoch'), "
+        "COALESCE(datetime(r.finished_at, 'unixepoch'), 'incomplete'), r.model, r.tp_size, r.container, "
+        "r.git_rev, r.slurm_job_id, COUNT(p.point_id) FROM runs r "
+        "LEFT JOIN points p ON p.run_id = r.run_id GROUP BY r.run_id ORDER BY r.run_id"
+    ):
+        print(",".join("" if v is None else str(v) for v in r))
+    conn.close()
+
+
+PIVOT_AXES = ["requests", "concurrency", "max_tokens", "temperature"]
+
+
+def print_pivot(rows: List[Dict], row_key: str, col_key: str, metric: str) -> None:
+    # One table per spec matrix so points from different matrices are never mixed in a cell.
+    by_matrix = defaultdict(list)
+    for r in rows:
+        by_matrix[r.get("matrix") or ""].append(r)
+    for n, (matrix, matrix_rows) in enumerate(sorted(by_matrix.items())):
+        cells = defaultdict(list)
+        for r in matrix_rows:
+            cells[(r[row_key], r[col_key])].append(r[metric])
+        averaged = [
+            axis
+            for axis in PIVOT_AXES
+            if axis not in (row_key, col_key) and len({r.get(axis) for r in matrix_rows}) > 1
+        ]
+        if any(r.get("repeat", 0) for r in matrix_rows):
+            averaged.append("repeats")
+        row_vals = sorted({k[0] for k in cells})
+        col_vals = sorted({k[1] for k in cells})
+        if n:
+            print()
+        label = f"matrix={matrix} " if matrix else ""
+        mean_note = f"mean over {', '.join(averaged)}" if averaged else "single point per cell"
+        print(f"{label}{metric} ({row_key} x {col_key}, {mean_note})")
+        print(",".join([f"{row_key}/{col_key}"] + [str(c) for c in col_vals]))
+        for rv in row_vals:
+            values = []
+            for cv in col_vals:
+                v = cells.get((rv, cv))
+                values.append(f"{sum(v) / len(v):.3f}" if v else "")
+            print(",".join([str(rv)] + values))
+
+
 def print_table(rows: List[Dict]) -> None:
     header = (
         "file,requests,concurrency,max_tokens,ok,failed,"
@@ -57,20 +150,57 @@ def print_table(rows: List[Dict]) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser(description="Summarize benchmark summary_*.json files")
-    parser.add_argument("--job-dir", required=True, help="Path to benchmarks/results/job_<jobid>")
+    parser = argparse.ArgumentParser(description="Summarize benchmark summary_*.json files or a sweep results DB")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--job-dir", help="Path to benchmarks/results/job_<jobid>")
+    source.add_argument("--db", help="Path to a sweep results.sqlite store")
     parser.add_argument(
         "--sort-by",
         default="ctok_s",
         choices=["ctok_s", "tok_s", "req_s", "p95"],
         help="Metric to sort by",
     )
+    parser.add_argument("--run-id", type=int, default=None, help="Sweep run to show (default: latest)")
+    parser.add_argument("--matrix", default=None, help="Only show points from this named spec matrix")
+    parser.add_argument("--list-runs", action="store_true", help="List runs and metadata stored in --db")
+    parser.add_argument(
+        "--pivot",
+        nargs=2,
+        metavar=("ROW", "COL"),
+        choices=PIVOT_AXES,
+        help="Pivot --sort-by metric over two sweep axes instead of listing points",
+    )
     args = parser.parse_args()
 
-    rows = load_rows(args.job_dir)
-    if not rows:
-        print(f"No summary_*.json files found in {args.job_dir}", file=sys.stderr)
+    if args.job_dir:
+        for flag, value in (("--run-id", args.run_id), ("--matrix", args.matrix)):
+            if value is not None:
+                parser.error(f"{flag} requires --db")
+    if args.db and not os.path.isfile(args.db):
+        print(f"Results DB not found: {args.db}", file=sys.stderr)
         return 2
+    if args.list_runs:
+        if not args.db:
+            parser.error("--list-runs requires --db")
+        print_runs(args.db)
+        return 0
+
+    if args.db:
+        rows = load_db_rows(args.db, args.run_id, args.matrix)
+        if not rows:
+            print(f"No sweep points found in {args.db}", file=sys.stderr)
+            return 2
+    else:
+        rows = load_rows(args.job_dir)
+        if not rows:
+            print(f"No summary_*.json files found in {args.job_dir}", file=sys.stderr)
+            return 2
+
+    if args.pivot:
+        if "temperature" in args.pivot and not args.db:
+            parser.error("--pivot on temperature requires --db")
+        print_pivot(rows, args.pivot[0], args.pivot[1], args.sort_by)
+        return 0
 
     reverse = args.sort_by != "p95"
     rows = sorted(rows, key=lambda x: x[args.sort_by], reverse=reverse)
@@ -8,8 +8,8 @@ import sys
 import time
 import urllib.request
 from collections import Counter
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
 
 TOKEN_RE = re.compile(r"[a-z0-9]+")
 
@@ -100,6 +100,50 @@ def load_docs(docs_dir: str) -> List[Doc]:
     return docs
 
 
+def doc_fingerprint(docs_dir: str) -> List[List]:
+    entries = []
+    for name in sorted(os.listdir(docs_dir)):
+        path = os.path.join(docs_dir, name)
+        if os.path.isfile(path) and name.lower().endswith((".md", ".txt")):
+            st = os.stat(path)
+            entries.append([name, st.st_size, st.st_mtime_ns])
+    return entries
+
+
+def load_or_build_index(docs_dir: str, cache_path: Optional[str]) -> List[Doc]:
+    if not cache_path:
+        return load_docs(docs_dir)
+    if not os.path.isdir(docs_dir):
+        raise FileNotFoundError(f"Docs directory not found: {docs_dir}")
+
+    fingerprint = doc_fingerprint(docs_dir)
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("fingerprint") == fingerprint:
+            return [Doc(**d) for d in cached["docs"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    docs = load_docs(docs_dir)
+    # The cache is only an optimisation; a failed write must not stop the demo.
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        cache_dir = os.path.dirname(cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "docs": [asdict(d) for d in docs]}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: could not write index cache {cache_path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return docs
+
+
 def retrieve(docs: List[Doc], query: str, k: int) -> List[Doc]:
     q_counts = Counter(tokenize(query))
     # Build query vector using doc IDF derived from docs
@@ -142,6 +186,67 @@ def get_model_id(base_url: str) -> str:
     return data[0].get("id")
 
 
+def last_log_line(path: Optional[str]) -> str:
+    if not path:
+        return ""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - 4096))
+            tail = f.read().decode("utf-8", errors="replace")
+    except OSError:
+        return ""
+    lines = [line.strip() for line in tail.splitlines() if line.strip()]
+    return lines[-1] if lines else ""
+
+
+def process_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def wait_for_server(
+    base_url: str,
+    max_wait_s: float,
+    log_path: Optional[str] = None,
+    server_pid: Optional[int] = None,
+    initial_poll_s: float = 0.5,
+    max_poll_s: float = 10.0,
+) -> str:
+    # Poll quickly at first, then back off so a slow model load is not hammered.
+    start = time.monotonic()
+    deadline = start + max_wait_s
+    poll_s = initial_poll_s
+    last_error = None
+    last_progress = ""
+    while True:
+        try:
+            return get_model_id(base_url)
+        except Exception as e:
+            last_error = e
+        if not process_alive(server_pid):
+            raise RuntimeError(f"vLLM server process {server_pid} exited before becoming ready")
+        now = time.monotonic()
+        if now >= deadline:
+            raise RuntimeError(
+                f"{base_url}/models did not become ready within {max_wait_s:.0f}s. Last error: {last_error}"
+            )
+        progress = last_log_line(log_path)
+        if progress and progress != last_progress:
+            print(f"[waiting {now - start:5.0f}s] {progress[:160]}", flush=True)
+            last_progress = progress
+        time.sleep(min(poll_s, deadline - now))
+        poll_s = min(poll_s * 1.5, max_poll_s)
+
+
 def slurm_template(account: str, partition: str, gpus: int, hours: int) -> str:
     return f"""#!/bin/bash
 #SBATCH --job-name=vllm-demo
@@ -230,6 +335,19 @@ def read_questions_from_file(path: str) -> List[str]:
     return questions
 
 
+def warm_up(base_url: str, model: str, docs: List[Doc], questions: List[str], k: int, max_tokens: int) -> None:
+    # Run the real prompt pipeline so warm-up prompts span the same lengths as user questions.
+    for i, question in enumerate(questions, start=1):
+        messages = build_prompt(question, retrieve(docs, question, k), detect_tool_output(question))
+        start = time.perf_counter()
+        try:
+            chat(base_url, model, messages, max_tokens=max_tokens)
+        except Exception as e:
+            print(f"Warm-up {i}/{len(questions)} failed: {e}")
+            continue
+        print(f"Warm-up {i}/{len(questions)}: {time.perf_counter() - start:.2f}s", flush=True)
+
+
 def run_single_question(question: str, docs: List[Doc], base_url: str, model: str, k: int):
     retrieved = retrieve(docs, question, k)
     tool_output = detect_tool_output(question)
@@ -249,6 +367,13 @@ def run_single_question(question: str, docs: List[Doc], base_url: str, model: st
     print(answer)
 
 
+def job_start_time() -> float:
+    try:
+        return float(os.environ.get("JOB_START_TS") or time.time())
+    except ValueError:
+        return time.time()
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="LUMI vLLM demo agent")
     parser.add_argument("--docs", default="./lumi_docs", help="Path to docs directory")
@@ -257,21 +382,63 @@ def main() -> int:
     parser.add_argument("--top-k", type=int, default=3, help="Number of docs to retrieve")
     parser.add_argument("--question", help="Single question to answer")
     parser.add_argument("--question-file", help="File with one question per line")
+    parser.add_argument("--index-cache", help="JSON file to load/save the retrieval index")
+    parser.add_argument(
+        "--wait-ready-s",
+        type=float,
+        default=0.0,
+        help="Max time to wait for /models before giving up (0 = no wait)",
+    )
+    parser.add_argument("--server-log", help="vLLM log to tail for progress while waiting")
+    parser.add_argument("--server-pid", type=int, help="vLLM PID; stop waiting early if it exits")
+    parser.add_argument("--warmup-file", help="File with warm-up questions, one per line")
+    parser.add_argument("--warmup-max-tokens", type=int, default=16, help="max_tokens for warm-up requests")
+    parser.add_argument(
+        "--start-time",
+        type=float,
+        default=job_start_time(),
+        help="Epoch seconds to measure time-to-first-answer from (default: $JOB_START_TS)",
+    )
     args = parser.parse_args()
 
     try:
-        docs = load_docs(args.docs)
+        index_start = time.perf_counter()
+        docs = load_or_build_index(args.docs, args.index_cache)
     except FileNotFoundError as e:
         print(f"Error: {e}")
         return 2
+    print(f"Retrieval index ready: {len(docs)} docs in {time.perf_counter() - index_start:.2f}s")
 
     try:
-        model = args.model or get_model_id(args.base_url)
+        if args.wait_ready_s > 0:
+            served_model = wait_for_server(args.base_url, args.wait_ready_s, args.server_log, args.server_pid)
+        else:
+            served_model = None
+        model = args.model or served_model or get_model_id(args.base_url)
     except Exception as e:
         print(f"Error: failed to get model id from {args.base_url}: {e}")
         return 3
 
-    print(f"Using model: {model}")
+    print(f"Using model: {model} (ready {time.time() - args.start_time:.1f}s after start)")
+
+    if args.warmup_file:
+        try:
+            warmup_questions = read_questions_from_file(args.warmup_file)
+        except OSError as e:
+            print(f"Warning: skipping warm-up, cannot read {args.warmup_file}: {e}")
+            warmup_questions = []
+        warm_up(args.base_url, model, docs, warmup_questions, args.top_k, args.warmup_max_tokens)
+
+    print(f"Prompt ready {time.time() - args.start_time:.1f}s after start (index, model load and warm-up)")
+
+    first_answer_reported = False
+
+    def answer(question: str) -> None:
+        nonlocal first_answer_reported
+        run_single_question(question, docs, args.base_url, model, args.top_k)
+        if not first_answer_reported:
+            print(f"\n(time from start to first answer: {time.time() - args.start_time:.1f}s)")
+            first_answer_reported = True
 
     if args.question_file:
         questions = read_questions_from_file(args.question_file)
@@ -279,11 +446,11 @@ def main() -> int:
             print("Error: no questions found in question file")
             return 4
         for q in questions:
-            run_single_question(q, docs, args.base_url, model, args.top_k)
+            answer(q)
         return 0
 
     if args.question:
-        run_single_question(args.question, docs, args.base_url, model, args.top_k)
+        answer(args.question)
         return 0
 
     print("Enter questions (type 'exit' to quit).")
@@ -296,7 +463,7 @@ def main() -> int:
             continue
         if q.lower() in {"exit", "quit"}:
             break
-        run_single_question(q, docs, args.base_url, model, args.top_k)
+        answer(q)
     return 0
 
 
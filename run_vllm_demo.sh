@@ -15,18 +15,22 @@ CONTAINER="/appl/local/laifs/containers/lumi-multitorch-u24r64f21m43t29-20260124
 MODEL="/scratch/project_462000131/anisrahm/models/Mistral-7B-Instruct-v0.2"
 PORT="8000"
 TP_SIZE="1"
+READY_WAIT_S="600"
+WARMUP_FILE="/work/examples/warmup_questions.txt"
+JOB_START_TS="$(date +%s)"
 
 WORKDIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 RUNTIME_BASE="/scratch/project_462000131/${USER}/vllm_runtime"
 RUNTIME_DIR="${RUNTIME_BASE}/${SLURM_JOB_ID}"
-mkdir -p "${RUNTIME_DIR}"
+INDEX_CACHE_DIR="${RUNTIME_BASE}/index_cache"
+mkdir -p "${RUNTIME_DIR}" "${INDEX_CACHE_DIR}"
 
-BIND_ARGS=(--bind "${WORKDIR}:/work" --bind "${RUNTIME_DIR}:/runtime")
+BIND_ARGS=(--bind "${WORKDIR}:/work" --bind "${RUNTIME_DIR}:/runtime" --bind "${INDEX_CACHE_DIR}:/index_cache")
 if [ -d "${MODEL}" ]; then
   BIND_ARGS+=(--bind "${MODEL}:${MODEL}")
 fi
 
-export MODEL PORT TP_SIZE
+export MODEL PORT TP_SIZE READY_WAIT_S WARMUP_FILE JOB_START_TS
 
 apptainer exec --rocm "${BIND_ARGS[@]}" "${CONTAINER}" bash -s <<'EOS'
 set -euo pipefail
@@ -51,33 +55,16 @@ cleanup() {
 }
 trap cleanup EXIT
 
-if ! python - <<'PY'
-import os
-import time
-import urllib.request
-import sys
-
-port = int(os.environ["PORT"])
-base_url = f"http://127.0.0.1:{port}/v1/models"
-
-for attempt in range(60):
-    try:
-        with urllib.request.urlopen(base_url, timeout=5) as resp:
-            if resp.status == 200:
-                print("vLLM ready.")
-                sys.exit(0)
-    except Exception:
-        pass
-    if attempt == 59:
-        raise SystemExit("vLLM did not become ready in time.")
-    else:
-        time.sleep(2)
-PY
+if ! python /work/demo_agent.py \
+  --base-url "http://127.0.0.1:${PORT}/v1" \
+  --index-cache /index_cache/retrieval_index.json \
+  --wait-ready-s "${READY_WAIT_S}" \
+  --server-log "${LOG_PATH}" \
+  --server-pid "${VLLM_PID}" \
+  --warmup-file "${WARMUP_FILE}"
 then
-  echo "vLLM failed to start. Last server log lines:" >&2
+  echo "Demo agent exited with an error. Last server log lines:" >&2
   tail -n 80 "${LOG_PATH}" >&2 || true
   exit 1
 fi
-
-python /work/demo_agent.py --base-url "http://127.0.0.1:${PORT}/v1"
 EOS